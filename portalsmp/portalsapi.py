@@ -5,9 +5,32 @@ from pyrogram.raw.functions.messages import RequestAppWebView
 from pyrogram.raw.types import InputBotAppShortName, InputUser
 from pyrogram.raw.functions.users import GetUsers
 from curl_cffi import requests
+import json
 import re
+import threading
 from portalsmp.collections_ids import collections_ids
 
+# Decode responses with orjson when available (~2-3x faster than the
+# stdlib on large search/floor payloads); fall back to json otherwise.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# One curl_cffi Session per worker thread: keeps TCP+TLS connections alive
+# between calls (requests.get/post open a fresh connection every time),
+# while staying thread-safe since Sessions must not be shared across
+# threads.  Chrome impersonation is preserved on every request.
+_thread_local = threading.local()
+
+def _session() -> requests.Session:
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
 def cap(text) -> str:
     words = re.findall(r"\w+(?:'\w+)?", text)
     for word in words:
@@ -152,11 +175,12 @@ def search(sort: str = "price_asc", offset: int = 0, limit: int = 20, gift_name:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: search(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()["results"] if response.json()["results"] else response.json()
+    data = _loads(response.content)
+    return data["results"] if data["results"] else data
 
 def giftsFloors(authData: str = "") -> dict:
     """
@@ -180,11 +204,12 @@ def giftsFloors(authData: str = "") -> dict:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: giftsFloors(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['floorPrices'] if response.json()['floorPrices'] else None
+    data = _loads(response.content)
+    return data['floorPrices'] if data['floorPrices'] else None
 
 def myPortalsGifts(offset: int = 0, limit: int = 20, listed: bool = True, authData: str = "") -> list:
     """
@@ -214,11 +239,12 @@ def myPortalsGifts(offset: int = 0, limit: int = 20, listed: bool = True, authDa
     
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myPortalsGifts(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['nfts'] if 'nfts' in response.json() else response.json()
+    data = _loads(response.content)
+    return data['nfts'] if 'nfts' in data else data
 
 def myPoints(authData: str = "") -> dict:
     """
@@ -241,11 +267,11 @@ def myPoints(authData: str = "") -> dict:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myPoints(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def myBalances(authData: str = "") -> dict:
     """
@@ -268,11 +294,11 @@ def myBalances(authData: str = "") -> dict:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myBalances(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def myActivity(offset: int = 0, limit: int = 20, authData: str = "") -> list:
     """
@@ -297,11 +323,12 @@ def myActivity(offset: int = 0, limit: int = 20, authData: str = "") -> list:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myActivity(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['actions'] if response.json()['actions'] else response.json()
+    data = _loads(response.content)
+    return data['actions'] if data['actions'] else data
 
 def collections(limit: int = 100, authData: str = "") -> list:
     """
@@ -325,11 +352,12 @@ def collections(limit: int = 100, authData: str = "") -> list:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: collections(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['collections'] if response.json()['collections'] else response.json()
+    data = _loads(response.content)
+    return data['collections'] if data['collections'] else data
 
 def marketActivity(sort: str = "latest", offset: int = 0, limit: int = 20, activityType: str | list = "", gift_name: str | list= "", model: str | list = "", backdrop: str | list = "", symbol: str | list = "", min_price: int = 0, max_price: int = 100000, authData: str = "") -> list:
     """
@@ -413,11 +441,12 @@ def marketActivity(sort: str = "latest", offset: int = 0, limit: int = 20, activ
         URL += f"&action_types={activityType}"
 
     HEADERS["Authorization"] = authData
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: marketActivity(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['actions'] if 'actions' in response.json() else response.json()
+    data = _loads(response.content)
+    return data['actions'] if 'actions' in data else data
 
 def convertForListing(nft_id: str = "", price: float = 0):
     return {"nft_id": nft_id, "price": str(price)}
@@ -455,11 +484,11 @@ def bulkList(nfts: list = [], authData: str = "") -> dict:
         "nft_prices": nfts
     }
 
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: bulkList(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def sale(nft_id: str = "", price: int|float = 0,authData: str = "") -> dict | None:
     """
@@ -498,11 +527,11 @@ def sale(nft_id: str = "", price: int|float = 0,authData: str = "") -> dict | No
         "nft_prices": nfts
     }
 
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: sale(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def buy(nft_id: str = "", price: int|float = 0, authData: str = "") -> dict | None:
     """
@@ -543,11 +572,11 @@ def buy(nft_id: str = "", price: int|float = 0, authData: str = "") -> dict | No
         "nft_details": nfts
     }
 
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: buy(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def makeOffer(nft_id: str = "", offer_price: float = 0, expiration_days: int = 7, authData: str = "") -> dict | None:
     """
@@ -594,11 +623,11 @@ def makeOffer(nft_id: str = "", offer_price: float = 0, expiration_days: int = 7
     if expiration_days == 7:
         PAYLOAD["offer"].update({"expiration_days": expiration_days})
     
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: makeOffer(): Error: status_code: {response.status_code}, response_text: {response.content}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def cancelOffer(offer_id: str = "", authData: str = "") -> dict | None:
     """
@@ -626,11 +655,11 @@ def cancelOffer(offer_id: str = "", authData: str = "") -> dict | None:
 
     HEADERS["Authorization"] = authData
 
-    response = requests.post(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: cancelOffer(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def changePrice(nft_id: str = "", price: float = 0, authData: str = "") -> dict | None:
     """
@@ -667,11 +696,11 @@ def changePrice(nft_id: str = "", price: float = 0, authData: str = "") -> dict
         "price": str(price)
     }
 
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: changePrice(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 class PortalsGift:
     """
@@ -825,11 +854,11 @@ def withdrawPortals(amount: float = 0, wallet: str = "", authData: str = "") ->
         "external_address": wallet
         }
     
-    response = requests.post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().post(URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: withdrawPortals(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def collectionOffer(gift_name: str = "", amount: float | int = 0, expiration_days: int = 7, max_nfts: int = 1, authData: str = ""):
     """
@@ -887,12 +916,12 @@ def collectionOffer(gift_name: str = "", amount: float | int = 0, expiration_day
         "max_nfts": max_nfts
     }
 
-    response = requests.post(url=URL, headers=HEADERS, json=PAYLOAD, impersonate="chrome110")
+    response = _session().post(url=URL, headers=HEADERS, json=PAYLOAD, impersonate="chrome110")
 
     if response.status_code not in [200,201,204]:
         raise Exception(f"portalsmp: collectionOffer(): Error: status_code: {response.status_code}, response_text: {response.text}")
     
-    return response.json() if response.status_code in [200, 201] else None
+    return _loads(response.content) if response.status_code in [200, 201] else None
 
 def cancelCollectionOffer(offer_id: str = "", authData: str = ""):
     URL = API_URL + "collection-offers/cancel"
@@ -909,12 +938,12 @@ def cancelCollectionOffer(offer_id: str = "", authData: str = ""):
         "id": offer_id
     }
 
-    response = requests.post(url=URL, headers=HEADERS, json=PAYLOAD, impersonate="chrome110")
+    response = _session().post(url=URL, headers=HEADERS, json=PAYLOAD, impersonate="chrome110")
 
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: cancelCollectionOffer(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def allCollectionOffers(gift_name: str = "", authData: str = "") -> list:
     """
@@ -943,10 +972,10 @@ def allCollectionOffers(gift_name: str = "", authData: str = "") -> list:
     
     URL += f"{ID}/all"
     HEADERS["Authorization"] = authData
-    response = requests.get(url=URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(url=URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: allCollectionOffers(): Error: status_code: {response.status_code}, response_text: {response.text}")
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def filterFloors(gift_name: str = "", authData: str = "") -> dict:
     """
@@ -974,10 +1003,11 @@ def filterFloors(gift_name: str = "", authData: str = "") -> dict:
 
     URL += f"?short_names={gift_name}"
     HEADERS["Authorization"] = authData
-    response = requests.get(url=URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(url=URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: filters(): Error: status_code: {response.status_code}, response_text: {response.text}")
-    return response.json()['floor_prices'][gift_name] if response.status_code == 200 else None
+    data = _loads(response.content)
+    return data['floor_prices'][gift_name] if response.status_code == 200 else None
 
 def myPlacedOffers(offset: int = 0, limit: int = 20, authData: str = ""):
     """
@@ -1002,11 +1032,12 @@ def myPlacedOffers(offset: int = 0, limit: int = 20, authData: str = ""):
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myPlacedOffers(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['offers'] if 'offers' in response.json() else response.json()
+    data = _loads(response.content)
+    return data['offers'] if 'offers' in data else data
 
 def editOffer(offer_id: str = "", new_price: float = 0, authData: str = "") -> None:
     """
@@ -1037,10 +1068,10 @@ def editOffer(offer_id: str = "", new_price: float = 0, authData: str = "") -> N
     }
 
     HEADERS["Authorization"] = authData
-    response = requests.patch(url=URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
+    response = _session().patch(url=URL, json=PAYLOAD, headers=HEADERS, impersonate="chrome110")
     if response.status_code not in [200, 204]:
         raise Exception(f"portalsmp: editOffer(): Error: status_code: {response.status_code}, response_text: {response.text}")
-    return None if response.status_code == 204 else response.json()
+    return None if response.status_code == 204 else _loads(response.content)
 
 def myReceivedOffers(offset: int = 0, limit: int = 20, authData: str = ""):
     """
@@ -1065,11 +1096,12 @@ def myReceivedOffers(offset: int = 0, limit: int = 20, authData: str = ""):
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myReceivedOffers(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json()['top_offers'] if 'top_offers' in response.json() else response.json()
+    data = _loads(response.content)
+    return data['top_offers'] if 'top_offers' in data else data
 
 def myCollectionOffers(authData: str = ""):
     """
@@ -1092,11 +1124,11 @@ def myCollectionOffers(authData: str = ""):
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL, headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL, headers=HEADERS, impersonate="chrome110")
     if response.status_code != 200:
         raise Exception(f"portalsmp: myCollectionOffers(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
 
 def topOffer(gift_name: str = "", authData: str = ""):
     """
@@ -1126,9 +1158,9 @@ def topOffer(gift_name: str = "", authData: str = ""):
 
     HEADERS["Authorization"] = authData
 
-    response = requests.get(URL + f"{ID}/top", headers=HEADERS, impersonate="chrome110")
+    response = _session().get(URL + f"{ID}/top", headers=HEADERS, impersonate="chrome110")
 
     if response.status_code != 200:
         raise Exception(f"portalsmp: topOffer(): Error: status_code: {response.status_code}, response_text: {response.text}")
 
-    return response.json() if response.status_code == 200 else None
+    return _loads(response.content) if response.status_code == 200 else None
@@ -1,10 +1,36 @@
 import json
+import threading
 import urllib.parse
 from curl_cffi import requests
 from tonnelmp.wtf import generate_wtf
 from datetime import datetime, timezone, timedelta
 from fake_useragent import UserAgent
 
+# orjson decodes the multi-page gift payloads several times faster than the
+# stdlib; fall back to json.loads when it is not installed.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Connection reuse
+#
+# Every API helper used to issue its request through the module-level
+# requests.post, which opens a fresh TCP+TLS connection per call — painful
+# when a scan fetches dozens of pages.  Instead each thread keeps one
+# curl_cffi Session alive and reuses it, so keep-alive amortizes the TLS
+# handshake across requests.  Sessions are per-thread because curl handles
+# must not be shared between threads.
+_thread_local = threading.local()
+
+def _session() -> requests.Session:
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
 HEADERS = {
     "authority": "",
     "accept": "*/*",
@@ -172,7 +198,7 @@ def getGifts(
         payload["price_range"] = 0
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: getGifts(): Request failed with error: {e}")
 
@@ -181,7 +207,7 @@ def getGifts(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: getGifts(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def myGifts(
     listed: bool = True,
@@ -256,7 +282,7 @@ def myGifts(
         "user_auth": authData
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: myGifts(): Request failed with error: {e}")
 
@@ -265,7 +291,7 @@ def myGifts(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: myGifts(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def listForSale(
     gift_id: int,
@@ -312,7 +338,7 @@ def listForSale(
         "wtf": wtf
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: listForSale(): Request failed with error: {e}")
 
@@ -321,7 +347,7 @@ def listForSale(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: listForSale(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def cancelSale(
     gift_id: int,
@@ -364,7 +390,7 @@ def cancelSale(
         "wtf": wtf
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: cancelSale(): Request failed with error: {e}")
 
@@ -373,7 +399,7 @@ def cancelSale(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: cancelSale(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def saleHistory(
     authData: str,
@@ -459,7 +485,7 @@ def saleHistory(
         "sort": json.loads(sort_value)
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: saleHistory(): Request failed with exception {e}")
 
@@ -468,7 +494,7 @@ def saleHistory(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: saleHistory(): equest failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def getAuctions(
     gift_name: str = None,
@@ -575,7 +601,7 @@ def getAuctions(
     else:
         payload["price_range"] = 0
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: getAuctions(): Request failed with error: {e}")
 
@@ -584,7 +610,7 @@ def getAuctions(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: getAuctions(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def iso(hours: int) -> str:
     dt = datetime.now(timezone.utc) + timedelta(hours=hours)
@@ -645,7 +671,7 @@ def createAuction(
     HEADERS["user-agent"] = user_agent
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: createAuction(): Request failed with error: {e}")
 
@@ -654,7 +680,7 @@ def createAuction(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: createAuction(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def cancelAuction(
     auction_id: str,
@@ -693,7 +719,7 @@ def cancelAuction(
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: cancelAuction(): Request failed with error: {e}")
 
@@ -702,7 +728,7 @@ def cancelAuction(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: cancelAuction(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def buyGift(
     gift_id: int,
@@ -761,7 +787,7 @@ def buyGift(
             "showPrice": showPrice
         })
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: buyGift(): Request failed with error: {e}")
 
@@ -770,7 +796,7 @@ def buyGift(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: buyGift(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 
 def info(
@@ -807,7 +833,7 @@ def info(
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: info(): Request failed with error: {e}")
 
@@ -816,7 +842,7 @@ def info(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: info(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 class Gift:
     """
@@ -939,7 +965,7 @@ def withdraw(
         "asset": asset
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=15, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=15, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: withdraw(): Request failed with error: {e}")
 
@@ -948,7 +974,7 @@ def withdraw(
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: withdraw(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def returnGift(gift_id: int, authData: str, proxies: dict | None = None) -> dict:
     """
@@ -983,7 +1009,7 @@ def returnGift(gift_id: int, authData: str, proxies: dict | None = None) -> dict
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: returnGift(): Request failed with error: {e}")
 
@@ -992,7 +1018,7 @@ def returnGift(gift_id: int, authData: str, proxies: dict | None = None) -> dict
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: returnGift(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def placeBid(auction_id: str, amount: int | float, authData: str, asset: str = "TON", proxies: dict | None = None) -> dict:
     """
@@ -1030,7 +1056,7 @@ def placeBid(auction_id: str, amount: int | float, authData: str, asset: str = "
         "asset": asset
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: placeBid(): Request failed with error: {e}")
 
@@ -1039,7 +1065,7 @@ def placeBid(auction_id: str, amount: int | float, authData: str, asset: str = "
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: placeBid(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def switchTransfer(authData: str, transferGift: bool, proxies: dict | None = None) -> dict:
     """
@@ -1073,7 +1099,7 @@ def switchTransfer(authData: str, transferGift: bool, proxies: dict | None = Non
         "authData": authData
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: switchTransfer(): Request failed with error: {e}")
 
@@ -1082,7 +1108,7 @@ def switchTransfer(authData: str, transferGift: bool, proxies: dict | None = Non
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: switchTransfer(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def mintGift(authData: str, wallet: str, gift_id: int, proxies: dict | None = None) -> dict:
     """
@@ -1123,7 +1149,7 @@ def mintGift(authData: str, wallet: str, gift_id: int, proxies: dict | None = No
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=15, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=15, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: mintGift(): Request failed with error: {e}")
     
@@ -1132,7 +1158,7 @@ def mintGift(authData: str, wallet: str, gift_id: int, proxies: dict | None = No
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: mintGift(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def unlockListing(authData: str, gift_id: int, proxies: dict | None = None) -> dict:
     """
@@ -1169,7 +1195,7 @@ def unlockListing(authData: str, gift_id: int, proxies: dict | None = None) -> d
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: unlockListing(): Request failed: {e}")
     
@@ -1178,7 +1204,7 @@ def unlockListing(authData: str, gift_id: int, proxies: dict | None = None) -> d
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: unlockListing(): Request failed with status code {response.status_code}")
 
-    return response.json()
+    return _loads(response.content)
 
 def giveawayInfo(giveaway_id: str, authData: str, proxies: dict | None = None) -> dict:
     """
@@ -1214,7 +1240,7 @@ def giveawayInfo(giveaway_id: str, authData: str, proxies: dict | None = None) -
         "authData": authData
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: giveawayInfo(): Request failed: {e}")
     
@@ -1223,7 +1249,7 @@ def giveawayInfo(giveaway_id: str, authData: str, proxies: dict | None = None) -
     elif response.status_code != 200:
         raise Exception(f"tonnelmp: giveawayInfo(): getGiveawayInfo failed {response.status_code}: {response.text}")
 
-    return response.json()
+    return _loads(response.content)
 
 def joinGiveaway(
     giveaway_id: str,
@@ -1266,14 +1292,14 @@ def joinGiveaway(
     HEADERS["user-agent"] = user_agent
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: joinGiveaway(): Request failed: {e}")
 
     if response.status_code != 200:
         raise Exception(f"tonnelmp: joinGiveaway(): Request failed {response.status_code}: {response.text}")
 
-    return response.json()
+    return _loads(response.content)
 
 def filterStats(authData: str, proxies: dict = None) -> dict:
     """
@@ -1305,14 +1331,14 @@ def filterStats(authData: str, proxies: dict = None) -> dict:
     }
 
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: filterStats(): Request failed: {e}")
 
     if response.status_code != 200:
         raise Exception(f"tonnelmp: filterStats(): Request failed {response.status_code}: {response.text}")
 
-    return response.json()
+    return _loads(response.content)
 
 import re
 
@@ -1350,14 +1376,14 @@ def filterStatsPretty(authData: str, proxies: dict = None) -> dict:
         "authData": authData
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: filterStatsPretty(): Request failed: {e}")
 
     if response.status_code != 200:
         raise Exception(f"tonnelmp: filterStatsPretty(): Request failed {response.status_code}: {response.text}")
 
-    r = response.json()
+    r = _loads(response.content)
 
     if r.get("status") != "success":
         raise Exception("tonnelmp: filterStatsPretty(): api error: " + r.get("message", "unknown error"))
@@ -1448,7 +1474,7 @@ def giftData(
         "ref": ""
     }
     try:
-        response = requests.post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
+        response = _session().post(URL, headers=HEADERS, json=payload, impersonate="chrome110", timeout=10, proxies=proxies)
     except Exception as e:
         raise Exception(f"tonnelmp: giftData(): Request failed: {e}")
 